@@ -1,16 +1,51 @@
 """Alchemy."""
 
+import bisect
+import heapq
+import sys
+
+
+def intern_name(name):
+    """
+    Return the interned copy of the name if it is a string, otherwise the name itself.
+
+    :param name: Name of an element.
+    :return: The name, interned when possible.
+    """
+    if isinstance(name, str):
+        return sys.intern(name)
+    return name
+
 
 class AlchemicalElement:
     """
     AlchemicalElement class.
 
-    Every element must have a name.
+    Every element must have a name. The name is interned and can not be changed, so that one element object
+    can safely be stored in many places at once.
     """
 
+    __slots__ = ("name",)
+
     def __init__(self, name: str) -> None:
         """Initialize class."""
-        self.name = name
+        object.__setattr__(self, "name", intern_name(name))
+
+    def __setattr__(self, key, value):
+        """Set an attribute, unless it is the name."""
+        if key == "name":
+            raise AttributeError("name of an AlchemicalElement can not be changed")
+        object.__setattr__(self, key, value)
+
+    def __delattr__(self, key):
+        """Delete an attribute, unless it is the name."""
+        if key == "name":
+            raise AttributeError("name of an AlchemicalElement can not be deleted")
+        object.__delattr__(self, key)
+
+    def __reduce__(self):
+        """Pickle the element by its name, so that the name is interned again when it is loaded."""
+        return type(self), (self.name,)
 
     def __repr__(self) -> str:
         """Represent class."""
@@ -77,6 +112,16 @@ class AlchemicalStorage:
         self.storage = []
         return ret
 
+    def contents(self) -> list[AlchemicalElement]:
+        """
+        Return a list of all of the elements in storage without removing them.
+
+        Order of the list is the same as the order in which the elements were added.
+
+        :return: A new list of all of the elements that are in the storage.
+        """
+        return list(self.storage)
+
     def get_content(self) -> str:
         """
         Return a string that gives an overview of the contents of the storage.
@@ -97,7 +142,7 @@ class AlchemicalStorage:
         :return: Content as a string.
         """
         dic = dict()
-        for element in self.storage:
+        for element in self.contents():
             dic[element.name] = dic.get(element.name, 0) + 1
         lst = []
         for key in dic:
@@ -121,6 +166,7 @@ class AlchemicalRecipes:
         """
         self.recipes = dict()
         self.reverse_recipes = dict()
+        self.elements = dict()
 
     def add_recipe(self, first_component_name: str, second_component_name: str, product_name: str):
         """
@@ -139,6 +185,8 @@ class AlchemicalRecipes:
         recipe = self.get_recipe(first_component_name, second_component_name)
         if recipe in self.recipes:
             raise RecipeOverlapException
+        product_name = intern_name(product_name)
+        recipe = (intern_name(recipe[0]), intern_name(recipe[1]))
         self.recipes[recipe] = product_name
         self.reverse_recipes[product_name] = recipe
 
@@ -166,6 +214,21 @@ class AlchemicalRecipes:
         recipe = self.get_recipe(first_component_name, second_component_name)
         return self.recipes.get(recipe, None)
 
+    def element(self, name: str) -> AlchemicalElement:
+        """
+        Return the shared plain element with the given name.
+
+        Cauldrons and purifiers use it for the elements they create, so that a storage holds the same object many
+        times instead of a new one every time. There is one shared element for every name used in the recipes.
+
+        :param name: Name of an element in the recipes.
+        :return: The AlchemicalElement object shared by everything using this recipe book.
+        """
+        element = self.elements.get(name)
+        if element is None:
+            element = self.elements[name] = AlchemicalElement(name)
+        return element
+
     def get_component_names(self, result):
         """Get component names given their result."""
         return self.reverse_recipes.get(result, None)
@@ -197,12 +260,27 @@ class Cauldron(AlchemicalStorage):
     Cauldron class.
 
     Extends the 'AlchemicalStorage' class.
+
+    Storage only holds the elements that can still react: plain elements and catalysts that have uses left.
+    Catalysts without uses are moved to exhausted_catalysts, indexed by name, together with the tick at which they
+    were added. Adding does not have to walk over them, and they are put back in their place in the order when the
+    contents are read.
+
+    The tick of every element in storage is kept at the same index in ticks, so storage and ticks are internal
+    to the cauldron and must only be changed through its methods. Use contents to read what is in the cauldron.
+
+    Setting sink to an object with the methods of instrumentation.Sink reports every reaction, pop and extract to it.
     """
 
+    sink = None
+
     def __init__(self, recipes: AlchemicalRecipes):
         """Initialize the Cauldron class."""
         super().__init__()
         self.recipebook = recipes
+        self.ticks = []
+        self.tick = 0
+        self.exhausted_catalysts = dict()
 
     def add(self, element: AlchemicalElement):
         """
@@ -221,33 +299,128 @@ class Cauldron(AlchemicalStorage):
         :param element: Input object to add to storage.
         """
         if isinstance(element, AlchemicalElement):
+            sink = self.sink
+            if sink is not None:
+                sink.begin(self, element)
             if isinstance(element, Catalyst) and element.uses <= 0:
-                self.storage.append(element)
+                if sink is not None:
+                    sink.settle(self, element, 0)
+                self.store(element)
                 return
-            for i in range(len(self.storage) - 1, -1, -1):
+            size = len(self.storage)
+            for i in range(size - 1, -1, -1):
                 el = self.storage[i]
                 recipe = AlchemicalRecipes.get_recipe(element.name, el.name)
                 if recipe in self.recipebook:
+                    if isinstance(el, Catalyst) and el.uses <= 0:
+                        self.retire(i)
+                        continue
+                    if sink is not None:
+                        sink.reaction(self, element, el, self.recipebook[recipe], size - i)
                     if isinstance(el, Catalyst):
-                        if el.uses > 0:
-                            el.uses -= 1
-                        else:
-                            continue
+                        el.uses -= 1
+                        if sink is not None:
+                            sink.catalyst_used(self, el)
+                        if el.uses <= 0:
+                            self.retire(i)
+                    else:
+                        del self.storage[i]
+                        del self.ticks[i]
                     if isinstance(element, Catalyst):
                         element.uses -= 1
-                        self.storage.append(element)
-
-                    if not isinstance(el, Catalyst):
-                        self.pop(el.name)
-                    self.add(AlchemicalElement(self.recipebook[recipe]))
+                        if sink is not None:
+                            sink.catalyst_used(self, element)
+                        self.store(element)
+                    self.add(self.recipebook.element(self.recipebook[recipe]))
                     return
-            self.storage.append(element)
+            if sink is not None:
+                sink.settle(self, element, size)
+            self.store(element)
         else:
             raise TypeError
 
+    def store(self, element: AlchemicalElement):
+        """
+        Put element into storage, or among the exhausted catalysts if it is a catalyst without uses.
+
+        :param element: Element to store.
+        """
+        if isinstance(element, Catalyst) and element.uses <= 0:
+            self.exhausted_catalysts.setdefault(element.name, []).append((self.tick, element))
+            self.tick += 1
+            return
+        self.storage.append(element)
+        self.ticks.append(self.tick)
+        self.tick += 1
+
+    def retire(self, index: int):
+        """
+        Move a catalyst that has run out of uses from storage to the exhausted catalysts.
+
+        :param index: Index of the catalyst in storage.
+        """
+        catalyst = self.storage.pop(index)
+        tick = self.ticks.pop(index)
+        bisect.insort(self.exhausted_catalysts.setdefault(catalyst.name, []), (tick, catalyst), key=lambda x: x[0])
+
+    def pop(self, element_name: str):
+        """
+        Remove and return the most recently added element with the given name, exhausted catalysts included.
+
+        :param element_name: Name of the element to remove.
+        :return: The removed AlchemicalElement object or None.
+        """
+        if self.sink is not None:
+            self.sink.pop(self, element_name)
+        exhausted = self.exhausted_catalysts.get(element_name)
+        exhausted_tick = exhausted[-1][0] if exhausted else -1
+        for i in range(len(self.storage) - 1, -1, -1):
+            if self.ticks[i] < exhausted_tick:
+                break
+            if self.storage[i].name == element_name:
+                self.ticks.pop(i)
+                return self.storage.pop(i)
+        if exhausted:
+            element = exhausted.pop()[1]
+            if not exhausted:
+                del self.exhausted_catalysts[element_name]
+            return element
+        return None
+
+    def contents(self) -> list[AlchemicalElement]:
+        """
+        Return a list of all of the elements in the cauldron, exhausted catalysts included, without removing them.
+
+        :return: A list of all of the elements in the order in which they were added.
+        """
+        if not self.exhausted_catalysts:
+            return list(self.storage)
+        merged = heapq.merge(zip(self.ticks, self.storage), *self.exhausted_catalysts.values(), key=lambda x: x[0])
+        return [element for _, element in merged]
+
+    def extract(self) -> list[AlchemicalElement]:
+        """
+        Return a list of all of the elements from the cauldron and empty the cauldron itself.
+
+        :return: A list of all of the elements that were previously in the cauldron, in the order they were added.
+        """
+        if self.sink is not None:
+            self.sink.extract(self)
+        ret = self.contents()
+        self.storage = []
+        self.ticks = []
+        self.exhausted_catalysts = dict()
+        return ret
+
 
 class Purifier(AlchemicalStorage):
-    """Purifier class."""
+    """
+    Purifier class.
+
+    Setting sink to an object with the methods of instrumentation.Sink reports every decomposition to it.
+    """
+
+    sink = None
 
     def __init__(self, recipes: AlchemicalRecipes):
         """Initialize purifier class."""
@@ -260,8 +433,11 @@ class Purifier(AlchemicalStorage):
             if element.name not in self.recipebook.reverse_recipes:
                 self.storage.append(element)
             else:
-                for el in self.recipebook.get_component_names(element.name):
-                    self.add(AlchemicalElement(el))
+                components = self.recipebook.get_component_names(element.name)
+                if self.sink is not None:
+                    self.sink.decompose(self, element, components)
+                for el in components:
+                    self.add(self.recipebook.element(el))
         else:
             raise TypeError
 
@@ -269,6 +445,8 @@ class Purifier(AlchemicalStorage):
 class Catalyst(AlchemicalElement):
     """Catalyst class."""
 
+    __slots__ = ("uses",)
+
     def __init__(self, name: str, uses: int) -> None:
         """Initialize class."""
         super().__init__(name)
@@ -277,3 +455,7 @@ class Catalyst(AlchemicalElement):
     def __repr__(self) -> str:
         """Class representation."""
         return f"<C: {self.name} ({self.uses})>" # Tes
+
+    def __reduce__(self):
+        """Pickle the catalyst by its name and uses."""
+        return type(self), (self.name, self.uses)
@@ -0,0 +1,195 @@
+"""
+Benchmark suite for the alchemy classes.
+
+Times Cauldron.add, Purifier.add, AlchemicalStorage.pop, extract and get_content on synthetic workloads of growing
+size, prints the scaling curves and optionally writes the results as JSON so that runs can be compared.
+
+Usage:
+    python bench.py --sizes 250 500 1000 --output before.json
+    python bench.py --sizes 250 500 1000 --compare before.json
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import time
+
+from alchemy import AlchemicalElement, AlchemicalStorage, Cauldron, Purifier
+from workload import SHAPES, generate_recipes, generate_stream
+
+OPERATIONS = ("cauldron_add", "purifier_add", "pop", "extract", "get_content")
+
+
+def best_of(repeat: int, setup, run) -> float:
+    """
+    Return the shortest time of run over a number of repeats.
+
+    :param repeat: Number of times to run.
+    :param setup: Function that prepares a fresh state for every run, its result is passed to run.
+    :param run: Function to time.
+    :return: The shortest run time in seconds.
+    """
+    best = math.inf
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_workload(shape: str, size: int, catalyst_ratio: float, repeat: int, seed: int) -> dict[str, float]:
+    """
+    Time every operation on one workload.
+
+    The recipe book has the given shape and size, and every stream holds size elements.
+
+    :return: A dictionary from operation name to its best time in seconds.
+    """
+    recipes, names = generate_recipes(shape, size, seed=seed)
+    products = list(recipes.reverse_recipes)
+
+    def stream():
+        return generate_stream(names, size, catalyst_ratio, seed=seed)
+
+    def filled_cauldron():
+        cauldron = Cauldron(recipes)
+        for element in stream():
+            cauldron.add(element)
+        return cauldron
+
+    def filled_storage():
+        storage = AlchemicalStorage()
+        for element in stream():
+            storage.add(element)
+        order = [element.name for element in storage.storage]
+        random.Random(seed).shuffle(order)
+        return storage, order
+
+    def products_stream():
+        rng = random.Random(seed)
+        return [AlchemicalElement(rng.choice(products)) for _ in range(size)]
+
+    def cauldron_add(elements):
+        cauldron = Cauldron(recipes)
+        for element in elements:
+            cauldron.add(element)
+
+    def purifier_add(elements):
+        purifier = Purifier(recipes)
+        for element in elements:
+            purifier.add(element)
+
+    def pop(state):
+        storage, order = state
+        for name in order:
+            storage.pop(name)
+
+    return {
+        "cauldron_add": best_of(repeat, stream, cauldron_add),
+        "purifier_add": best_of(repeat, products_stream, purifier_add),
+        "pop": best_of(repeat, filled_storage, pop),
+        "extract": best_of(repeat, filled_cauldron, lambda cauldron: cauldron.extract()),
+        "get_content": best_of(repeat, filled_cauldron, lambda cauldron: cauldron.get_content()),
+    }
+
+
+def scaling(sizes: list[int], times: list[float]) -> list[float]:
+    """
+    Return the scaling exponent between every pair of neighbouring sizes.
+
+    An exponent of 1 means the time grows linearly with the size, 2 quadratically and so on.
+    """
+    exponents = []
+    for i in range(1, len(sizes)):
+        if times[i - 1] > 0 and times[i] > 0:
+            exponents.append(math.log(times[i] / times[i - 1]) / math.log(sizes[i] / sizes[i - 1]))
+        else:
+            exponents.append(math.nan)
+    return exponents
+
+
+def run(shapes: list[str], sizes: list[int], catalyst_ratio: float, repeat: int, seed: int) -> dict:
+    """Run the benchmarks and return the results in the JSON format."""
+    results = []
+    for shape in shapes:
+        for size in sizes:
+            times = bench_workload(shape, size, catalyst_ratio, repeat, seed)
+            for operation, seconds in times.items():
+                results.append({"shape": shape, "size": size, "operation": operation, "seconds": seconds})
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "catalyst_ratio": catalyst_ratio,
+            "repeat": repeat,
+            "seed": seed,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def report(data: dict, baseline: dict = None) -> str:
+    """
+    Format the results as one table per shape with the times and scaling exponents of every operation.
+
+    If a baseline is given, every time is followed by its ratio to the baseline time of the same measurement.
+    """
+    old = dict()
+    if baseline is not None:
+        for row in baseline["results"]:
+            old[(row["shape"], row["size"], row["operation"])] = row["seconds"]
+    lines = []
+    shapes = list(dict.fromkeys(row["shape"] for row in data["results"]))
+    for shape in shapes:
+        rows = [row for row in data["results"] if row["shape"] == shape]
+        sizes = sorted({row["size"] for row in rows})
+        lines.append(f"{shape}:")
+        lines.append(f"  {'operation':<14}" + "".join(f"{size:>20}" for size in sizes) + "   scaling")
+        for operation in OPERATIONS:
+            times = dict()
+            for row in rows:
+                if row["operation"] == operation:
+                    times[row["size"]] = row["seconds"]
+            if not times:
+                continue
+            cells = []
+            for size in sizes:
+                cell = f"{times[size] * 1000:.2f}ms"
+                key = (shape, size, operation)
+                if key in old and old[key] > 0:
+                    cell += f" ({times[size] / old[key]:.2f}x)"
+                cells.append(f"{cell:>20}")
+            exponents = scaling(sizes, [times[size] for size in sizes])
+            lines.append(f"  {operation:<14}" + "".join(cells) + "   " + " ".join(f"{e:.2f}" for e in exponents))
+    return "\n".join(lines)
+
+
+def main():
+    """Parse the command line arguments and run the benchmarks."""
+    parser = argparse.ArgumentParser(description="Benchmark the alchemy classes.")
+    parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=list(SHAPES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[125, 250, 500, 1000])
+    parser.add_argument("--catalysts", type=float, default=0.1, help="share of catalysts in element streams")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="file to write the results to as JSON")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    args = parser.parse_args()
+
+    data = run(args.shapes, sorted(args.sizes), args.catalysts, args.repeat, args.seed)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print(report(data, baseline))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(data, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Measure the memory used by element storage with tracemalloc."""
+
+import random
+import tracemalloc
+
+from alchemy import AlchemicalElement, AlchemicalRecipes, AlchemicalStorage, Cauldron, Purifier
+
+
+class DictElement:
+    """Element with a __dict__ and its own name string, the way AlchemicalElement used to be."""
+
+    def __init__(self, name: str) -> None:
+        """Initialize class."""
+        self.name = name
+
+
+def measure(build) -> tuple[int, int]:
+    """
+    Run build under tracemalloc.
+
+    :param build: Function that creates the objects to measure and returns them.
+    :return: Tuple of the memory still held by the result and the peak memory, in bytes.
+    """
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, peak
+
+
+def fill_storage(make, kinds: int, count: int) -> AlchemicalStorage:
+    """
+    Fill a storage with count elements of the given number of kinds, every name built as a new string.
+
+    The elements are appended directly, so that the old element representation fits into the storage as well.
+    """
+    storage = AlchemicalStorage()
+    for i in range(count):
+        storage.storage.append(make(f"Element{i % kinds}"))
+    return storage
+
+
+def make_recipes(depth: int) -> AlchemicalRecipes:
+    """Build a recipe chain E0 + B0 -> E1, E1 + B1 -> E2 and so on."""
+    recipes = AlchemicalRecipes()
+    for i in range(depth):
+        recipes.add_recipe(f"E{i}", f"B{i}", f"E{i + 1}")
+    return recipes
+
+
+def main():
+    """Print the memory used by storages, cauldrons and purifiers."""
+    count = 200_000
+    rows = [
+        ("storage, __dict__ elements", lambda: fill_storage(DictElement, 50, count)),
+        ("storage, slotted elements", lambda: fill_storage(AlchemicalElement, 50, count)),
+        ("storage, shared elements", lambda: fill_storage(AlchemicalRecipes().element, 50, count)),
+    ]
+
+    depth = 20
+    recipes = make_recipes(depth)
+
+    def run_cauldron():
+        rng = random.Random(0)
+        cauldron = Cauldron(recipes)
+        for _ in range(count // 100):
+            name = "E0" if rng.random() < 0.1 else f"B{rng.randrange(depth)}"
+            cauldron.add(AlchemicalElement(name))
+        return cauldron
+
+    def run_purifier():
+        purifier = Purifier(recipes)
+        for _ in range(count // depth):
+            purifier.add(AlchemicalElement(f"E{depth}"))
+        return purifier
+
+    rows.append(("cauldron", run_cauldron))
+    rows.append(("purifier", run_purifier))
+
+    for label, build in rows:
+        current, peak = measure(build)
+        print(f"{label:<28} held {current / 1024:>10.1f} KiB  peak {peak / 1024:>10.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
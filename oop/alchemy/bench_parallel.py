@@ -0,0 +1,48 @@
+"""Benchmark scaling of the parallel cauldron simulation across cores."""
+
+import os
+import time
+
+from alchemy import AlchemicalElement, AlchemicalRecipes, Cauldron
+from parallel import simulate_cauldrons
+from workload import generate_recipes, generate_stream
+
+
+def run_serial(recipes: AlchemicalRecipes, streams: list[list[AlchemicalElement]]) -> list[list[AlchemicalElement]]:
+    """Simulate all of the streams in the current process."""
+    results = []
+    for stream in streams:
+        cauldron = Cauldron(recipes)
+        for element in stream:
+            cauldron.add(element)
+        results.append(cauldron.extract())
+    return results
+
+
+def main():
+    """Print the run time and speedup for an increasing number of worker processes."""
+    recipes, names = generate_recipes("dense", 300)
+
+    def make_streams():
+        # Catalysts are used up by every run, so each run gets fresh streams.
+        return [generate_stream(names, 100, 0.1, seed=i) for i in range(1000)]
+
+    streams = make_streams()
+    start = time.perf_counter()
+    run_serial(recipes, streams)
+    serial = time.perf_counter() - start
+    print(f"serial: {serial:.3f}s")
+
+    processes = 1
+    cpus = os.cpu_count() or 1
+    while processes <= cpus:
+        streams = make_streams()
+        start = time.perf_counter()
+        simulate_cauldrons(recipes, streams, processes)
+        elapsed = time.perf_counter() - start
+        print(f"{processes:>3} processes: {elapsed:.3f}s (speedup x {serial / elapsed:.2f})")
+        processes *= 2
+
+
+if __name__ == "__main__":
+    main()
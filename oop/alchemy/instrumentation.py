@@ -0,0 +1,280 @@
+"""
+Instrumentation for cauldrons and purifiers.
+
+Instrumentation is off by default. To turn it on, set the sink attribute of a Cauldron or a Purifier:
+
+    stats = Stats()
+    cauldron = Cauldron(recipes)
+    cauldron.sink = stats
+    ...
+    print(stats.summary())
+
+Every call of Cauldron.add starts with a begin event and ends in one of two ways. Either the element reacts with an element in storage and the
+product is added in turn, or the element settles into storage. So one element added from outside produces a chain of
+reaction events followed by a single settle event, and the number of reactions in the chain is its depth.
+"""
+
+import time
+
+from alchemy import AlchemicalElement, AlchemicalRecipes, Catalyst, Cauldron, Purifier
+
+
+class Sink:
+    """
+    Sink class.
+
+    Receives events from instrumented cauldrons and purifiers and ignores them.
+    Extend it and override the events of interest.
+    """
+
+    def begin(self, cauldron: Cauldron, element: AlchemicalElement):
+        """
+        Handle the start of a call of add, before the storage is scanned.
+
+        :param cauldron: The cauldron the element is added to.
+        :param element: The element being added.
+        """
+
+    def reaction(self, cauldron: Cauldron, element: AlchemicalElement, partner: AlchemicalElement, product_name: str,
+                 scanned: int):
+        """
+        Handle a reaction, reported before the cauldron changes anything.
+
+        :param cauldron: The cauldron where the reaction happens.
+        :param element: The element being added.
+        :param partner: The element in storage that it reacts with.
+        :param product_name: The name of the product.
+        :param scanned: Number of elements in storage looked at to find the partner, exhausted catalysts
+            retired during the scan included.
+        """
+
+    def settle(self, cauldron: Cauldron, element: AlchemicalElement, scanned: int):
+        """
+        Handle an element going into storage without reacting.
+
+        :param cauldron: The cauldron the element is added to.
+        :param element: The element being stored.
+        :param scanned: Number of elements in storage looked at without finding a partner, exhausted catalysts
+            retired during the scan included.
+        """
+
+    def catalyst_used(self, cauldron: Cauldron, catalyst: Catalyst):
+        """
+        Handle a catalyst using up one of its uses.
+
+        :param cauldron: The cauldron where the catalyst was used.
+        :param catalyst: The catalyst, with its uses already reduced.
+        """
+
+    def pop(self, cauldron: Cauldron, element_name: str):
+        """
+        Handle a call of pop, reported before anything is removed.
+
+        :param cauldron: The cauldron the element is removed from.
+        :param element_name: The name passed to pop.
+        """
+
+    def extract(self, cauldron: Cauldron):
+        """
+        Handle a call of extract, reported before the cauldron is emptied.
+
+        :param cauldron: The cauldron being emptied.
+        """
+
+    def decompose(self, purifier: Purifier, element: AlchemicalElement, components: tuple[str, str]):
+        """
+        Handle an element being split into its components.
+
+        :param purifier: The purifier that splits the element.
+        :param element: The element being split.
+        :param components: The names of its components.
+        """
+
+
+class Stats(Sink):
+    """
+    Stats class, counts the events it receives.
+
+    Time is measured from the begin event of an element added from outside to the settle event that ends its chain,
+    so busy only holds the time spent inside add, not the time between calls.
+    """
+
+    def __init__(self):
+        """Initialize the Stats class."""
+        self.busy = 0.0
+        self.chain_start = None
+        self.adds = 0
+        self.reactions = 0
+        self.scanned = 0
+        self.longest_scan = 0
+        self.chain = 0
+        self.chain_depths = dict()
+        self.catalyst_uses = dict()
+        self.decompositions = 0
+        self.components = 0
+
+    def begin(self, cauldron, element):
+        """Start the clock if this add starts a new chain."""
+        if self.chain_start is None:
+            self.chain_start = time.perf_counter()
+
+    def reaction(self, cauldron, element, partner, product_name, scanned):
+        """Count a reaction and its scan, and extend the current chain."""
+        self.reactions += 1
+        self.chain += 1
+        self.count_scan(scanned)
+
+    def settle(self, cauldron, element, scanned):
+        """Count a finished add, record the depth of its chain and stop the clock."""
+        if self.chain_start is not None:
+            self.busy += time.perf_counter() - self.chain_start
+            self.chain_start = None
+        self.adds += 1
+        self.chain_depths[self.chain] = self.chain_depths.get(self.chain, 0) + 1
+        self.chain = 0
+        self.count_scan(scanned)
+
+    def catalyst_used(self, cauldron, catalyst):
+        """Count a use of a catalyst by its name."""
+        self.catalyst_uses[catalyst.name] = self.catalyst_uses.get(catalyst.name, 0) + 1
+
+    def decompose(self, purifier, element, components):
+        """Count a decomposition and its components."""
+        self.decompositions += 1
+        self.components += len(components)
+
+    def count_scan(self, scanned: int):
+        """Add the length of a scan to the totals."""
+        self.scanned += scanned
+        if scanned > self.longest_scan:
+            self.longest_scan = scanned
+
+    def summary(self) -> dict:
+        """
+        Return an overview of the counted events.
+
+        :return: A dictionary of rates, averages and totals.
+        """
+        scans = self.reactions + self.adds
+        return {
+            "busy": self.busy,
+            "adds": self.adds,
+            "reactions": self.reactions,
+            "reactions_per_second": self.reactions / self.busy if self.busy > 0 else 0.0,
+            "average_scan": self.scanned / scans if scans else 0.0,
+            "longest_scan": self.longest_scan,
+            "chain_depths": dict(sorted(self.chain_depths.items())),
+            "catalyst_uses": dict(self.catalyst_uses),
+            "decompositions": self.decompositions,
+            "average_fan_out": self.components / self.decompositions if self.decompositions else 0.0,
+        }
+
+
+class Trace(Sink):
+    """
+    Trace class, records what was done to a cauldron and the reactions that followed.
+
+    Every add, pop and extract is recorded in operations, in order. Added elements are recorded by name, and
+    catalysts together with the uses they had when they were added, so a trace can be replayed into a new cauldron.
+    Changes made to a cauldron by other means, such as editing its storage directly, are not recorded.
+    Purifiers are not traced: their decompositions are passed to decompose, which Trace ignores.
+    """
+
+    def __init__(self):
+        """Initialize the Trace class."""
+        self.operations = []
+        self.reactions = []
+        self.in_chain = False
+
+    def record_input(self, element: AlchemicalElement):
+        """Record the element if it starts a new chain, which means it was added from outside."""
+        if not self.in_chain:
+            if isinstance(element, Catalyst):
+                self.operations.append(("add", element.name, element.uses))
+            else:
+                self.operations.append(("add", element.name, None))
+
+    def reaction(self, cauldron, element, partner, product_name, scanned):
+        """Record the reaction, and the element if it was added from outside."""
+        self.record_input(element)
+        self.in_chain = True
+        self.reactions.append((element.name, partner.name, product_name))
+
+    def settle(self, cauldron, element, scanned):
+        """Record the element if it was added from outside, and end the chain."""
+        self.record_input(element)
+        self.in_chain = False
+
+    def pop(self, cauldron, element_name):
+        """Record the pop."""
+        self.operations.append(("pop", element_name))
+
+    def extract(self, cauldron):
+        """Record the extract."""
+        self.operations.append(("extract",))
+
+    def replay(self, recipes: AlchemicalRecipes, sink: Sink = None) -> Cauldron:
+        """
+        Repeat the recorded operations on a new cauldron in the same order.
+
+        :param recipes: The recipe book for the new cauldron.
+        :param sink: Sink for the new cauldron, for example a new Trace to check that the reactions repeat.
+        :return: The new cauldron.
+        """
+        cauldron = Cauldron(recipes)
+        cauldron.sink = sink
+        for operation in self.operations:
+            if operation[0] == "add":
+                name, uses = operation[1], operation[2]
+                if uses is None:
+                    cauldron.add(AlchemicalElement(name))
+                else:
+                    cauldron.add(Catalyst(name, uses))
+            elif operation[0] == "pop":
+                cauldron.pop(operation[1])
+            else:
+                cauldron.extract()
+        return cauldron
+
+
+class Tee(Sink):
+    """Tee class, passes every event on to several sinks."""
+
+    def __init__(self, *sinks: Sink):
+        """Initialize the Tee class."""
+        self.sinks = sinks
+
+    def begin(self, cauldron, element):
+        """Pass the start of the add on."""
+        for sink in self.sinks:
+            sink.begin(cauldron, element)
+
+    def reaction(self, cauldron, element, partner, product_name, scanned):
+        """Pass the reaction on."""
+        for sink in self.sinks:
+            sink.reaction(cauldron, element, partner, product_name, scanned)
+
+    def settle(self, cauldron, element, scanned):
+        """Pass the settled element on."""
+        for sink in self.sinks:
+            sink.settle(cauldron, element, scanned)
+
+    def catalyst_used(self, cauldron, catalyst):
+        """Pass the catalyst use on."""
+        for sink in self.sinks:
+            sink.catalyst_used(cauldron, catalyst)
+
+    def pop(self, cauldron, element_name):
+        """Pass the pop on."""
+        for sink in self.sinks:
+            sink.pop(cauldron, element_name)
+
+    def extract(self, cauldron):
+        """Pass the extract on."""
+        for sink in self.sinks:
+            sink.extract(cauldron)
+
+    def decompose(self, purifier, element, components):
+        """Pass the decomposition on."""
+        for sink in self.sinks:
+            sink.decompose(purifier, element, components)
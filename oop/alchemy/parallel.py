@@ -0,0 +1,63 @@
+"""Parallel simulation of many cauldrons that use the same recipe book."""
+
+import multiprocessing
+import os
+
+from alchemy import AlchemicalElement, AlchemicalRecipes, Cauldron
+
+_recipebook = None
+
+
+def _set_recipes(recipes: AlchemicalRecipes):
+    """
+    Store the recipe book in a worker process.
+
+    Runs once per worker as the pool initializer, so the recipe book is not sent with every task.
+
+    :param recipes: The recipe book for the cauldrons in this worker.
+    """
+    global _recipebook
+    _recipebook = recipes
+
+
+def _simulate(stream: list[AlchemicalElement]) -> list[AlchemicalElement]:
+    """
+    Feed a stream of elements into a new cauldron and return its extracted contents.
+
+    :param stream: Elements to add to the cauldron, in order.
+    :return: The contents of the cauldron after all of the elements were added.
+    """
+    cauldron = Cauldron(_recipebook)
+    for element in stream:
+        cauldron.add(element)
+    return cauldron.extract()
+
+
+def simulate_cauldrons(recipes: AlchemicalRecipes, streams: list[list[AlchemicalElement]], processes: int = None,
+                       chunksize: int = None) -> list[list[AlchemicalElement]]:
+    """
+    Simulate one cauldron per element stream across a process pool.
+
+    The recipe book is given to every worker once, through the pool initializer. With the fork start method the
+    initializer arguments are inherited copy-on-write without pickling, with other start methods every worker
+    unpickles its own copy once when it starts. Either way only the element streams and the results are sent with
+    the tasks.
+
+    Example:
+        recipes = AlchemicalRecipes()
+        recipes.add_recipe('Water', 'Wind', 'Ice')
+        streams = [[AlchemicalElement('Water'), AlchemicalElement('Wind')], [AlchemicalElement('Fire')]]
+        simulate_cauldrons(recipes, streams)  # -> [[<AE: Ice>], [<AE: Fire>]]
+
+    :param recipes: The recipe book used by all of the cauldrons.
+    :param streams: A list of element streams, one for each cauldron.
+    :param processes: Number of worker processes, defaults to the number of CPUs.
+    :param chunksize: Number of streams sent to a worker at a time.
+    :return: The extracted contents of every cauldron, in the same order as the streams.
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(streams) // (processes * 4))
+    with multiprocessing.Pool(processes, initializer=_set_recipes, initargs=(recipes,)) as pool:
+        return pool.map(_simulate, streams, chunksize)
@@ -0,0 +1,152 @@
+"""Planning what can be crafted from the contents of a storage."""
+
+import heapq
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional, Union
+
+from alchemy import AlchemicalRecipes, AlchemicalStorage
+
+Step = tuple[str, str, str]
+
+
+class CraftingPlanner:
+    """
+    CraftingPlanner class.
+
+    Finds the products that can be made from a set of elements and a short way to make them.
+    Every element that is available, or has been made once, is treated as being available in any amount, so a plan
+    tells which recipes to use and in which order, but not whether there is enough of every component for it.
+
+    The dependency graph of the recipe book is built once and shared by all queries. Solutions are memoized
+    per set of available elements, so repeating a query is a lookup, but queries with different, even overlapping,
+    sets are solved from scratch. At most cache_size solutions are kept, the least recently used are dropped first.
+    """
+
+    def __init__(self, recipes: AlchemicalRecipes, cache_size: int = 128):
+        """
+        Initialize the CraftingPlanner class.
+
+        :param recipes: The recipe book to plan with.
+        :param cache_size: Number of solutions to keep.
+        """
+        self.recipebook = recipes
+        self.producers = dict()
+        self.consumers = dict()
+        self.known_recipes = -1
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+
+    def build_graph(self):
+        """
+        Build the dependency graph of the recipe book, if the recipe book has changed since the last build.
+
+        For every product, producers holds the pairs of components that make it.
+        For every component, consumers holds the other components it can be combined with and their products.
+        """
+        if self.known_recipes == len(self.recipebook.recipes):
+            return
+        self.producers = dict()
+        self.consumers = dict()
+        for (first, second), product in self.recipebook.recipes.items():
+            self.producers.setdefault(product, []).append((first, second))
+            self.consumers.setdefault(first, []).append((second, product))
+            self.consumers.setdefault(second, []).append((first, product))
+        self.known_recipes = len(self.recipebook.recipes)
+        self.cache = OrderedDict()
+
+    def solve(self, available: Union[AlchemicalStorage, Iterable[str]]) -> Mapping[str, tuple]:
+        """
+        Find the cheapest recipe for every element that can be made from the available elements.
+
+        The cost of an element is the number of recipe steps needed to make it, counting every intermediate
+        product as many times as it is used.
+
+        :param available: A storage or the names of the elements that are available.
+        :return: A read-only mapping from element name to a tuple of its cost and the components used to make it.
+        """
+        self.build_graph()
+        if isinstance(available, AlchemicalStorage):
+            available = (element.name for element in available.contents())
+        base = frozenset(available)
+        if base in self.cache:
+            self.cache.move_to_end(base)
+            return self.cache[base]
+
+        best = {name: (0, None) for name in base}
+        done = dict()
+        queue = [(0, name) for name in base]
+        heapq.heapify(queue)
+        while queue:
+            cost, name = heapq.heappop(queue)
+            if name in done:
+                continue
+            done[name] = best[name]
+            for other, product in self.consumers.get(name, ()):
+                if other not in done or product in done:
+                    continue
+                new_cost = cost + done[other][0] + 1
+                if product not in best or new_cost < best[product][0]:
+                    best[product] = (new_cost, AlchemicalRecipes.get_recipe(name, other))
+                    heapq.heappush(queue, (new_cost, product))
+        solved = MappingProxyType(done)
+        self.cache[base] = solved
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return solved
+
+    def reachable(self, available: Union[AlchemicalStorage, Iterable[str]]) -> set[str]:
+        """
+        Return the names of all of the products that can be made from the available elements.
+
+        Example:
+            recipes = AlchemicalRecipes()
+            recipes.add_recipe('Water', 'Wind', 'Ice')
+            recipes.add_recipe('Ice', 'Fire', 'Water')
+            planner = CraftingPlanner(recipes)
+            planner.reachable(['Water', 'Wind'])  # -> {'Ice'}
+
+        :param available: A storage or the names of the elements that are available.
+        :return: A set of product names that are not available themselves.
+        """
+        return {name for name, (cost, _) in self.solve(available).items() if cost > 0}
+
+    def plan(self, available: Union[AlchemicalStorage, Iterable[str]], target: str) -> Optional[list[Step]]:
+        """
+        Return a list of recipe steps that makes the target from the available elements.
+
+        Every product is made with the recipe that solve found cheapest for it, and every step appears only once,
+        even if its product is used by several later steps. Every step is a tuple of the two component names and
+        the product name, and the components of a step are always available or made by an earlier step.
+
+        Example:
+            recipes = AlchemicalRecipes()
+            recipes.add_recipe('Water', 'Wind', 'Ice')
+            recipes.add_recipe('Ice', 'Fire', 'Steam')
+            planner = CraftingPlanner(recipes)
+            planner.plan(['Water', 'Wind', 'Fire'], 'Steam')  # -> [('Water', 'Wind', 'Ice'), ('Fire', 'Ice', 'Steam')]
+            planner.plan(['Water', 'Wind'], 'Steam')  # -> None
+
+        :param available: A storage or the names of the elements that are available.
+        :param target: Name of the element to make.
+        :return: A list of steps, empty if the target is already available, or None if it can not be made.
+        """
+        solved = self.solve(available)
+        if target not in solved:
+            return None
+        steps = []
+        made = set()
+        stack = [(target, False)]
+        while stack:
+            name, expanded = stack.pop()
+            components = solved[name][1]
+            if components is None or name in made:
+                continue
+            if expanded:
+                made.add(name)
+                steps.append((components[0], components[1], name))
+            else:
+                stack.append((name, True))
+                stack.append((components[1], False))
+                stack.append((components[0], False))
+        return steps
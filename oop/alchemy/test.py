@@ -0,0 +1,453 @@
+import pickle
+import time
+
+from alchemy import AlchemicalElement, AlchemicalRecipes, AlchemicalStorage, Catalyst, Cauldron, Purifier
+from instrumentation import Sink, Stats, Tee, Trace
+from parallel import simulate_cauldrons
+from planner import CraftingPlanner
+
+
+def make_recipes():
+    """
+    Recipe book used by the tests: Water + Wind -> Ice, Fire + Water -> Steam.
+    """
+    recipes = AlchemicalRecipes()
+    recipes.add_recipe("Water", "Wind", "Ice")
+    recipes.add_recipe("Fire", "Water", "Steam")
+    return recipes
+
+
+def test_cauldron_exhausted_catalyst_keeps_place_in_contents():
+    """
+    Testcase where a catalyst added without uses stays in its place in the order of contents.
+    """
+    cauldron = Cauldron(make_recipes())
+    cauldron.add(AlchemicalElement("Earth"))
+    cauldron.add(Catalyst("Wind", 0))
+    cauldron.add(AlchemicalElement("Fire"))
+    assert [repr(el) for el in cauldron.contents()] == ["<AE: Earth>", "<C: Wind (0)>", "<AE: Fire>"]
+    assert cauldron.storage[0].name == "Earth"
+    assert len(cauldron.storage) == 2
+
+
+def test_cauldron_exhausted_catalyst_does_not_react():
+    """
+    Testcase where an element matching an exhausted catalyst does not react with it.
+    """
+    cauldron = Cauldron(make_recipes())
+    cauldron.add(Catalyst("Wind", 0))
+    cauldron.add(AlchemicalElement("Water"))
+    assert [repr(el) for el in cauldron.extract()] == ["<C: Wind (0)>", "<AE: Water>"]
+
+
+def test_cauldron_exhausted_catalyst_in_extract_and_get_content():
+    """
+    Testcase where exhausted catalysts are returned by extract and counted by get_content.
+    """
+    cauldron = Cauldron(make_recipes())
+    cauldron.add(AlchemicalElement("Fire"))
+    cauldron.add(Catalyst("Wind", 0))
+    cauldron.add(AlchemicalElement("Earth"))
+    cauldron.add(Catalyst("Wind", 0))
+    assert cauldron.get_content() == "Content:\n * Earth x 1\n * Fire x 1\n * Wind x 2"
+    assert [repr(el) for el in cauldron.extract()] == ["<AE: Fire>", "<C: Wind (0)>", "<AE: Earth>", "<C: Wind (0)>"]
+    assert cauldron.extract() == []
+    assert cauldron.get_content() == "Content:\n Empty."
+
+
+def test_cauldron_catalyst_runs_out_mid_reaction():
+    """
+    Testcase where a catalyst in storage uses its last use and keeps its place after the product is added.
+    """
+    cauldron = Cauldron(make_recipes())
+    cauldron.add(AlchemicalElement("Fire"))
+    cauldron.add(Catalyst("Wind", 1))
+    cauldron.add(AlchemicalElement("Earth"))
+    cauldron.add(AlchemicalElement("Water"))
+    assert cauldron.exhausted_catalysts["Wind"][0][1].uses == 0
+    assert [repr(el) for el in cauldron.contents()] == ["<AE: Fire>", "<C: Wind (0)>", "<AE: Earth>", "<AE: Ice>"]
+    cauldron.add(AlchemicalElement("Water"))
+    assert [repr(el) for el in cauldron.extract()] == ["<C: Wind (0)>", "<AE: Earth>", "<AE: Ice>", "<AE: Steam>"]
+
+
+def test_cauldron_added_catalyst_runs_out_mid_reaction():
+    """
+    Testcase where a catalyst being added uses its last use and is stored after the reaction.
+    """
+    cauldron = Cauldron(make_recipes())
+    cauldron.add(AlchemicalElement("Water"))
+    cauldron.add(Catalyst("Wind", 1))
+    assert [repr(el) for el in cauldron.extract()] == ["<C: Wind (0)>", "<AE: Ice>"]
+
+
+def test_cauldron_pop_returns_newer_exhausted_catalyst():
+    """
+    Testcase where pop returns an exhausted catalyst that was added after a plain element with the same name.
+    """
+    cauldron = Cauldron(make_recipes())
+    cauldron.add(AlchemicalElement("Wind"))
+    cauldron.add(Catalyst("Wind", 0))
+    assert repr(cauldron.pop("Wind")) == "<C: Wind (0)>"
+    assert repr(cauldron.pop("Wind")) == "<AE: Wind>"
+    assert cauldron.pop("Wind") is None
+    assert cauldron.exhausted_catalysts == {}
+
+
+def test_cauldron_pop_returns_newer_plain_element():
+    """
+    Testcase where pop returns a plain element that was added after an exhausted catalyst with the same name.
+    """
+    cauldron = Cauldron(make_recipes())
+    cauldron.add(Catalyst("Wind", 0))
+    cauldron.add(AlchemicalElement("Wind"))
+    assert repr(cauldron.pop("Wind")) == "<AE: Wind>"
+    assert repr(cauldron.pop("Wind")) == "<C: Wind (0)>"
+
+
+def test_cauldron_reaction_removes_reacting_element():
+    """
+    Testcase where an element reacts with an older plain element while a newer exhausted catalyst has the same name.
+    """
+    cauldron = Cauldron(make_recipes())
+    cauldron.add(AlchemicalElement("Wind"))
+    cauldron.add(Catalyst("Wind", 0))
+    cauldron.add(AlchemicalElement("Water"))
+    assert [repr(el) for el in cauldron.extract()] == ["<C: Wind (0)>", "<AE: Ice>"]
+
+
+def test_contents_returns_copy():
+    """
+    Testcase where changing the list returned by contents does not change the storage or the cauldron.
+    """
+    for storage in [AlchemicalStorage(), Cauldron(make_recipes())]:
+        storage.add(AlchemicalElement("Earth"))
+        storage.contents().clear()
+        assert [repr(el) for el in storage.contents()] == ["<AE: Earth>"]
+
+
+def test_element_name_is_read_only():
+    """
+    Testcase where changing the name of an element is not allowed.
+    """
+    element = AlchemicalElement("Water")
+    try:
+        element.name = "Fire"
+        assert False
+    except AttributeError:
+        assert element.name == "Water"
+    try:
+        del element.name
+        assert False
+    except AttributeError:
+        assert element.name == "Water"
+
+
+def test_element_name_not_string():
+    """
+    Testcase where an element name that is not a string is kept as it is.
+    """
+    assert AlchemicalElement(5).name == 5
+    catalyst = Catalyst("Wind", 2)
+    catalyst.uses -= 1
+    assert repr(catalyst) == "<C: Wind (1)>"
+
+
+def test_element_names_are_interned():
+    """
+    Testcase where elements with equal names built separately share one name string.
+    """
+    first = AlchemicalElement("".join(["Wa", "ter"]))
+    second = AlchemicalElement("".join(["Wat", "er"]))
+    assert first.name is second.name
+
+
+def test_recipes_share_created_elements():
+    """
+    Testcase where cauldron products and purifier components are the shared elements of the recipe book.
+    """
+    recipes = make_recipes()
+    cauldron = Cauldron(recipes)
+    for _ in range(2):
+        cauldron.add(AlchemicalElement("Water"))
+        cauldron.add(AlchemicalElement("Wind"))
+    first, second = cauldron.extract()
+    assert first is second is recipes.element("Ice")
+    purifier = Purifier(recipes)
+    purifier.add(AlchemicalElement("Ice"))
+    assert purifier.extract() == [recipes.element("Water"), recipes.element("Wind")]
+
+
+def test_elements_survive_pickling():
+    """
+    Testcase where elements and catalysts keep their type, name and uses through pickling.
+    """
+    loaded = pickle.loads(pickle.dumps([AlchemicalElement("Water"), Catalyst("Wind", 2)]))
+    assert [repr(el) for el in loaded] == ["<AE: Water>", "<C: Wind (2)>"]
+    assert type(loaded[1]) is Catalyst
+    assert loaded[0].name is AlchemicalElement("Water").name
+
+
+def make_planner_recipes():
+    """
+    Recipe book for the planner tests, with two ways to make Steam.
+    """
+    recipes = AlchemicalRecipes()
+    recipes.add_recipe("Water", "Wind", "Ice")
+    recipes.add_recipe("Fire", "Ice", "Steam")
+    recipes.add_recipe("Fire", "Water", "Steam")
+    recipes.add_recipe("Earth", "Steam", "Mud")
+    return recipes
+
+
+def test_planner_reachable():
+    """
+    Testcase where products are reachable only through other products.
+    """
+    planner = CraftingPlanner(make_planner_recipes())
+    assert planner.reachable(["Water", "Wind"]) == {"Ice"}
+    assert planner.reachable(["Wind", "Fire"]) == set()
+    assert planner.reachable(["Water", "Wind", "Fire", "Earth"]) == {"Ice", "Steam", "Mud"}
+
+
+def test_planner_reachable_from_storage():
+    """
+    Testcase where the available elements are read from a cauldron, exhausted catalysts included.
+    """
+    cauldron = Cauldron(make_planner_recipes())
+    cauldron.add(AlchemicalElement("Water"))
+    cauldron.add(Catalyst("Wind", 0))
+    planner = CraftingPlanner(make_planner_recipes())
+    assert planner.reachable(cauldron) == {"Ice"}
+
+
+def test_planner_plan_takes_shortest_route():
+    """
+    Testcase where the shorter of two recipes for the target is used.
+    """
+    planner = CraftingPlanner(make_planner_recipes())
+    assert planner.plan(["Water", "Wind", "Fire"], "Steam") == [("Fire", "Water", "Steam")]
+    assert planner.plan(["Water", "Wind", "Fire", "Earth"], "Mud") == [("Fire", "Water", "Steam"),
+                                                                       ("Earth", "Steam", "Mud")]
+
+
+def test_planner_plan_through_intermediate():
+    """
+    Testcase where the plan has to make an intermediate product first.
+    """
+    recipes = AlchemicalRecipes()
+    recipes.add_recipe("Water", "Wind", "Ice")
+    recipes.add_recipe("Fire", "Ice", "Steam")
+    planner = CraftingPlanner(recipes)
+    assert planner.plan(["Water", "Wind", "Fire"], "Steam") == [("Water", "Wind", "Ice"), ("Fire", "Ice", "Steam")]
+
+
+def test_planner_plan_makes_shared_intermediate_once():
+    """
+    Testcase where an intermediate product is used by two later steps but is made only once.
+    """
+    recipes = AlchemicalRecipes()
+    recipes.add_recipe("A", "B", "X")
+    recipes.add_recipe("X", "C", "Y")
+    recipes.add_recipe("X", "Y", "T")
+    planner = CraftingPlanner(recipes)
+    assert planner.plan(["A", "B", "C"], "T") == [("A", "B", "X"), ("C", "X", "Y"), ("X", "Y", "T")]
+
+
+def test_planner_plan_unreachable_and_available():
+    """
+    Testcase where the target can not be made, or is already available.
+    """
+    planner = CraftingPlanner(make_planner_recipes())
+    assert planner.plan(["Water"], "Steam") is None
+    assert planner.plan(["Water"], "Water") == []
+
+
+def test_planner_solve_is_read_only_and_bounded():
+    """
+    Testcase where the solution can not be changed by the caller and the cache does not grow over its size.
+    """
+    planner = CraftingPlanner(make_planner_recipes(), cache_size=2)
+    solved = planner.solve(["Water", "Wind"])
+    try:
+        solved["Steam"] = (0, None)
+        assert False
+    except TypeError:
+        assert True
+    planner.solve(["Fire"])
+    planner.solve(["Earth"])
+    assert len(planner.cache) == 2
+    assert planner.plan(["Water", "Wind"], "Steam") is None
+
+
+def test_planner_sees_new_recipes():
+    """
+    Testcase where a recipe is added to the book after the planner was used.
+    """
+    recipes = make_planner_recipes()
+    planner = CraftingPlanner(recipes)
+    assert planner.reachable(["Earth", "Wind"]) == set()
+    recipes.add_recipe("Earth", "Wind", "Dust")
+    assert planner.reachable(["Earth", "Wind"]) == {"Dust"}
+
+
+def run_traced_session(cauldron):
+    """
+    Do a mix of adds, pops and extracts on a cauldron and return what it holds at the end.
+    """
+    cauldron.add(AlchemicalElement("Fire"))
+    cauldron.add(Catalyst("Wind", 1))
+    cauldron.add(AlchemicalElement("Water"))
+    cauldron.pop("Fire")
+    cauldron.add(AlchemicalElement("Water"))
+    cauldron.extract()
+    cauldron.add(AlchemicalElement("Fire"))
+    cauldron.add(AlchemicalElement("Wind"))
+    cauldron.pop("Wind")
+    cauldron.add(AlchemicalElement("Water"))
+    return [repr(el) for el in cauldron.contents()]
+
+
+def test_trace_replay_round_trip():
+    """
+    Testcase where replaying a trace with pops and extracts gives the same reactions and contents.
+    """
+    recipes = make_recipes()
+    trace = Trace()
+    cauldron = Cauldron(recipes)
+    cauldron.sink = trace
+    contents = run_traced_session(cauldron)
+    assert contents == ["<AE: Steam>"]
+    assert ("pop", "Fire") in trace.operations
+    assert ("extract",) in trace.operations
+
+    repeated = Trace()
+    replayed = trace.replay(recipes, repeated)
+    assert [repr(el) for el in replayed.contents()] == contents
+    assert repeated.operations == trace.operations
+    assert repeated.reactions == trace.reactions
+
+
+def test_stats_counts_reactions_and_catalysts():
+    """
+    Testcase where stats count reactions, chain depths, catalyst uses and decompositions.
+    """
+    recipes = make_recipes()
+    recipes.add_recipe("Earth", "Ice", "Glacier")
+    stats = Stats()
+    cauldron = Cauldron(recipes)
+    cauldron.sink = stats
+    cauldron.add(AlchemicalElement("Earth"))
+    cauldron.add(Catalyst("Wind", 1))
+    cauldron.add(AlchemicalElement("Water"))
+    purifier = Purifier(recipes)
+    purifier.sink = stats
+    purifier.add(AlchemicalElement("Glacier"))
+    summary = stats.summary()
+    assert summary["adds"] == 3
+    assert summary["reactions"] == 2
+    assert summary["chain_depths"] == {0: 2, 2: 1}
+    assert summary["catalyst_uses"] == {"Wind": 1}
+    assert summary["decompositions"] == 2
+    assert summary["average_fan_out"] == 2.0
+    assert [repr(el) for el in purifier.extract()] == ["<AE: Earth>", "<AE: Water>", "<AE: Wind>"]
+
+
+def test_stats_scan_counts_retired_catalysts():
+    """
+    Testcase where a catalyst retired during a scan is still counted in the length of the scan.
+    """
+    class Scans(Sink):
+        def __init__(self):
+            self.scans = []
+
+        def settle(self, cauldron, element, scanned):
+            self.scans.append(scanned)
+
+    cauldron = Cauldron(make_recipes())
+    catalyst = Catalyst("Wind", 1)
+    cauldron.add(catalyst)
+    cauldron.add(AlchemicalElement("Earth"))
+    catalyst.uses = 0
+    scans = Scans()
+    cauldron.sink = scans
+    cauldron.add(AlchemicalElement("Water"))
+    assert scans.scans == [2]
+    assert len(cauldron.storage) == 2
+
+
+def test_stats_busy_time_leaves_out_idle_time():
+    """
+    Testcase where time between calls of add is not counted as time spent reacting.
+    """
+    stats = Stats()
+    cauldron = Cauldron(make_recipes())
+    cauldron.sink = stats
+    cauldron.add(AlchemicalElement("Water"))
+    time.sleep(0.05)
+    cauldron.add(AlchemicalElement("Wind"))
+    time.sleep(0.05)
+    summary = stats.summary()
+    assert summary["reactions"] == 1
+    assert 0 < summary["busy"] < 0.05
+    assert summary["reactions_per_second"] > 20
+
+
+def test_tee_passes_events_to_every_sink():
+    """
+    Testcase where a tee gives the same events to two traces.
+    """
+    first = Trace()
+    second = Trace()
+    cauldron = Cauldron(make_recipes())
+    cauldron.sink = Tee(first, second)
+    run_traced_session(cauldron)
+    assert first.operations == second.operations
+    assert first.reactions == second.reactions
+    assert first.reactions == [("Water", "Wind", "Ice"), ("Water", "Fire", "Steam")]
+
+
+def test_cauldron_without_sink_is_unchanged():
+    """
+    Testcase where a cauldron without a sink gives the same contents as an instrumented one.
+    """
+    plain = Cauldron(make_recipes())
+    traced = Cauldron(make_recipes())
+    traced.sink = Stats()
+    assert run_traced_session(plain) == run_traced_session(traced)
+
+
+def make_streams():
+    """
+    Element streams for the parallel tests, with reactions, catalysts and an empty stream.
+    """
+    return [
+        [AlchemicalElement("Water"), AlchemicalElement("Wind")],
+        [AlchemicalElement("Fire")],
+        [],
+        [Catalyst("Wind", 1), AlchemicalElement("Water"), AlchemicalElement("Water"), AlchemicalElement("Fire")],
+        [AlchemicalElement("Fire"), AlchemicalElement("Water"), AlchemicalElement("Wind")],
+    ]
+
+
+def test_simulate_cauldrons_matches_serial_run():
+    """
+    Testcase where the parallel results are in stream order and equal to running the cauldrons one by one.
+    """
+    recipes = make_recipes()
+    expected = []
+    for stream in make_streams():
+        cauldron = Cauldron(recipes)
+        for element in stream:
+            cauldron.add(element)
+        expected.append([repr(el) for el in cauldron.extract()])
+    results = simulate_cauldrons(recipes, make_streams(), processes=2, chunksize=1)
+    assert [[repr(el) for el in result] for result in results] == expected
+    assert expected[0] == ["<AE: Ice>"]
+    assert expected[2] == []
+
+
+def test_simulate_cauldrons_no_streams():
+    """
+    Testcase where there are no streams to simulate.
+    """
+    assert simulate_cauldrons(make_recipes(), [], processes=2) == []
@@ -0,0 +1,73 @@
+"""Synthetic recipe books and element streams for benchmarking."""
+
+import random
+
+from alchemy import AlchemicalElement, AlchemicalRecipes, Catalyst
+
+SHAPES = ("wide", "deep", "dense")
+
+
+def generate_recipes(shape: str, size: int, density: float = 0.5, seed: int = 0) -> tuple[AlchemicalRecipes, list[str]]:
+    """
+    Generate a recipe book of the given shape.
+
+    Shapes:
+        wide  - size base elements, every neighbouring pair makes its own product: many short, independent recipes.
+        deep  - one chain E0 + B0 -> E1, E1 + B1 -> E2, ... of length size, so products keep reacting.
+        dense - size base elements, every pair makes a product with the given probability.
+
+    Example:
+        recipes, names = generate_recipes('deep', 2)
+        recipes.get_product_name('E1', 'B1')  # -> 'E2'
+        names  # -> ['E0', 'B0', 'B1']
+
+    :param shape: One of 'wide', 'deep' or 'dense'.
+    :param size: Number of base elements, or length of the chain for the deep shape.
+    :param density: Probability of a recipe for each pair of base elements in the dense shape.
+    :param seed: Seed for the random number generator.
+    :return: The recipe book and the names of the base elements to build element streams from.
+    """
+    recipes = AlchemicalRecipes()
+    if shape == "wide":
+        names = [f"W{i}" for i in range(size)]
+        for i in range(size - 1):
+            recipes.add_recipe(names[i], names[i + 1], f"P{i}")
+    elif shape == "deep":
+        names = ["E0"] + [f"B{i}" for i in range(size)]
+        for i in range(size):
+            recipes.add_recipe(f"E{i}", f"B{i}", f"E{i + 1}")
+    elif shape == "dense":
+        rng = random.Random(seed)
+        names = [f"D{i}" for i in range(size)]
+        for i, first in enumerate(names):
+            for second in names[i + 1:]:
+                if rng.random() < density:
+                    recipes.add_recipe(first, second, f"{first}+{second}")
+    else:
+        raise ValueError(f"Unknown shape: {shape}")
+    return recipes, names
+
+
+def generate_stream(names: list[str], length: int, catalyst_ratio: float = 0.0, max_uses: int = 3,
+                    seed: int = 0) -> list[AlchemicalElement]:
+    """
+    Generate a stream of elements with random names.
+
+    Catalysts are changed when they react, so a new stream must be generated for every run.
+
+    :param names: Names to pick the elements from.
+    :param length: Number of elements in the stream.
+    :param catalyst_ratio: Share of the elements that are catalysts.
+    :param max_uses: Largest number of uses a catalyst can have, the smallest is 0.
+    :param seed: Seed for the random number generator.
+    :return: A list of elements.
+    """
+    rng = random.Random(seed)
+    stream = []
+    for _ in range(length):
+        name = rng.choice(names)
+        if rng.random() < catalyst_ratio:
+            stream.append(Catalyst(name, rng.randint(0, max_uses)))
+        else:
+            stream.append(AlchemicalElement(name))
+    return stream